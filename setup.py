@@ -10,7 +10,18 @@ setup(
         "pydantic>=2.0.0",
         "click>=8.0.0",
         "pyyaml>=6.0",
+        "orjson>=3.8.0",
     ],
+    extras_require={
+        "dev": [
+            "pytest>=7.3.0",
+            "pytest-xdist>=3.0.0",
+            "pyfakefs>=5.0.0",
+            "pytest-benchmark>=4.0.0",
+            "black>=23.0.0",
+            "isort>=5.0.0",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "spindlewrit=project_generator.cli:main",
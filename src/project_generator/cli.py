@@ -5,7 +5,6 @@ from pathlib import Path
 
 from .models import ProjectConfig, ProjectType
 from .generator import ProjectGenerator
-from .gemma_integration import GemmaProjectClient, MockGemmaProjectClient
 
 
 @click.group()
@@ -29,13 +28,17 @@ def cli():
     default=os.getcwd(),
     help='Path where to create the project (defaults to current directory)'
 )
-def create(name, description, project_type, path):
+@click.option('--use-cargo', is_flag=True, help='Initialize Rust projects with `cargo init` instead of built-in templates')
+@click.option('--namespace-packages', is_flag=True, help='Generate Python packages without __init__.py files (PEP 420)')
+def create(name, description, project_type, path, use_cargo, namespace_packages):
     """Create a new project with the specified configuration."""
     config = ProjectConfig(
         name=name,
         description=description,
         project_type=ProjectType(project_type),
-        path=path
+        path=path,
+        use_cargo=use_cargo,
+        legacy_packages=not namespace_packages
     )
     
     generator = ProjectGenerator()
@@ -64,6 +67,9 @@ def create(name, description, project_type, path):
 @click.option('--mock', is_flag=True, help='Use mock Gemma client for testing (no API key required)')
 def from_todo(todo_id, output_dir, api_key, mock):
     """Create a project from a TODO item using Gemma-powered AI suggestions."""
+    # Imported here so `create` doesn't pay for loading requests/urllib3
+    from .gemma_integration import GemmaProjectClient, MockGemmaProjectClient
+    
     if mock:
         client = MockGemmaProjectClient()
         click.echo(click.style("Using mock Gemma client for testing", fg='yellow'))
@@ -84,6 +90,7 @@ def from_todo(todo_id, output_dir, api_key, mock):
             click.echo(click.style("Failed to generate project details from TODO", fg='red'))
             sys.exit(1)
         
+        # Gemma's output is untrusted, so it goes through full validation
         config = ProjectConfig(
             name=project_details['name'],
             description=project_details['description'],
@@ -108,6 +115,8 @@ def from_todo(todo_id, output_dir, api_key, mock):
     except Exception as e:
         click.echo(click.style(f"Error: {str(e)}", fg='red'))
         sys.exit(1)
+    finally:
+        client.close()
 
 
 def main():
@@ -1,12 +1,109 @@
 import os
+import re
 import json
-from typing import Dict, Any, Optional
+import hashlib
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Optional, Set, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+
+    def _json_key(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+except ImportError:  # pragma: no cover - fall back to the stdlib codec
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    def _json_key(obj: Any) -> bytes:
+        return json.dumps(obj, sort_keys=True, default=str).encode()
+
+# (connect, read) timeouts in seconds for Todo Server and Gemma API calls
+REQUEST_TIMEOUT = (10, 60)
+
+# Cached todos are served directly while fresh, and served stale while a
+# background refresh runs until they expire (in seconds)
+TODO_CACHE_FRESH_SECONDS = 30
+TODO_CACHE_STALE_SECONDS = 300
+
+# Maximum number of Gemma results kept in the least-recently-used result cache
+RESULT_CACHE_SIZE = 256
+
+# Prompt parsing patterns used by the mock client
+_DESC_RE = re.compile(r"Description: (.*?)(?:\n|$)")
+_PROJ_RE = re.compile(r"Project: (.*?)(?:\n|$)")
+_CLEAN_RE = re.compile(r'[^a-z0-9\s-]')
+_WS_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=128)
+def _prompt_for(description: str, project: str, context: str) -> str:
+    """Format the project prompt; retried todos reuse the formatted string."""
+    prompt = f"""
+        Generate a project structure based on the following TODO item:
+        
+        Description: {description}
+        Project: {project}
+        
+        Additional context:
+        {context}
+        
+        Your task is to determine:
+        1. An appropriate project name (in kebab-case format)
+        2. A concise project description
+        3. The most suitable project type (python, rust, or common)
+        4. Any additional details needed for the project setup
+        
+        Please use the function calling to provide structured output.
+        """
+    return prompt
 
 
 class GemmaProjectClient:
     """Client for Gemma function calling integration for project generation."""
     
+    # Whether generate_from_todo reuses results for unchanged todo content
+    _cache_results = True
+    
+    # Function schema Gemma fills in for project generation (never mutated)
+    _FUNCTION_SCHEMA = {
+        "name": "generate_project_structure",
+        "description": "Generate a new project structure based on a todo description",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Project name (in kebab-case format)"
+                },
+                "description": {
+                    "type": "string",
+                    "description": "Short description of the project"
+                },
+                "project_type": {
+                    "type": "string",
+                    "enum": ["python", "rust", "common"],
+                    "description": "Type of project to create"
+                },
+                "additional_details": {
+                    "type": "object",
+                    "description": "Additional project details specific to the project type"
+                }
+            },
+            "required": ["name", "description", "project_type"]
+        }
+    }
+    
     def __init__(self, api_key: str, base_url: Optional[str] = None):
         """
         Initialize the Gemma client.
@@ -24,6 +121,44 @@ class GemmaProjectClient:
         
         # Todo Server URL for fetching todo items
         self.todo_server_url = os.environ.get("TODO_SERVER_URL", "http://localhost:8000")
+        
+        # Persistent session so repeated calls reuse pooled keep-alive connections
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update(self.headers)
+        
+        # Todo cache: todo_id -> (fetched_at, todo_data)
+        self._todo_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._todo_cache_lock = threading.Lock()
+        self._revalidating: Set[str] = set()
+        
+        # Result cache: SHA-256 of the todo content -> Gemma arguments as
+        # UTF-8 JSON bytes, which are far smaller than the parsed dicts
+        self._result_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+    
+    def clear_cache(self) -> None:
+        """Drop all cached todos and Gemma results."""
+        with self._todo_cache_lock:
+            self._todo_cache.clear()
+        with self._result_cache_lock:
+            self._result_cache.clear()
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session and release pooled connections."""
+        self._session.close()
+    
+    def __enter__(self) -> "GemmaProjectClient":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
     def generate_from_todo(self, todo_id: str) -> Dict[str, Any]:
         """
@@ -39,89 +174,120 @@ class GemmaProjectClient:
         todo_data = self._fetch_todo(todo_id)
         if not todo_data:
             raise Exception(f"Todo item with ID {todo_id} not found")
-            
-        # 2. Define the function schema for Gemma
-        function_schema = {
-            "name": "generate_project_structure",
-            "description": "Generate a new project structure based on a todo description",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Project name (in kebab-case format)"
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "Short description of the project"
-                    },
-                    "project_type": {
-                        "type": "string",
-                        "enum": ["python", "rust", "common"],
-                        "description": "Type of project to create"
-                    },
-                    "additional_details": {
-                        "type": "object",
-                        "description": "Additional project details specific to the project type"
-                    }
-                },
-                "required": ["name", "description", "project_type"]
-            }
-        }
         
-        # 3. Create the prompt for Gemma
+        # Unchanged todo content produces the same project, so skip the Gemma call
+        cache_key = None
+        if self._cache_results:
+            cache_key = hashlib.sha256(_json_key(todo_data)).hexdigest()
+            with self._result_cache_lock:
+                cached = self._result_cache.get(cache_key)
+                if cached is not None:
+                    self._result_cache.move_to_end(cache_key)
+            if cached is not None:
+                return _json_loads(cached)
+            
+        # 2. Create the prompt for Gemma
         prompt = self._create_project_prompt(todo_data)
         
-        # 4. Call Gemma's function calling API
-        response = self._call_gemma_function(prompt, function_schema)
+        # 3. Call Gemma's function calling API
+        response = self._call_gemma_function(prompt, self._FUNCTION_SCHEMA)
         
-        # 5. Parse and return the result
+        # 4. Parse and return the result
         try:
             function_call = response.get("function_call", {})
             if not function_call or "arguments" not in function_call:
                 raise Exception("Failed to get function call response from Gemma")
                 
             # Parse the arguments JSON
-            arguments = json.loads(function_call["arguments"])
+            raw_arguments = function_call["arguments"]
+            arguments = _json_loads(raw_arguments)
+            
+            if cache_key is not None:
+                if isinstance(raw_arguments, str):
+                    raw_arguments = raw_arguments.encode()
+                with self._result_cache_lock:
+                    self._result_cache[cache_key] = raw_arguments
+                    if len(self._result_cache) > RESULT_CACHE_SIZE:
+                        self._result_cache.popitem(last=False)
             return arguments
             
         except json.JSONDecodeError:
             raise Exception("Invalid JSON response from Gemma function call")
     
     def _fetch_todo(self, todo_id: str) -> Dict[str, Any]:
-        """Fetch a todo item from the Todo Server."""
+        """Fetch a todo item, serving recent results from the in-memory cache."""
+        with self._todo_cache_lock:
+            entry = self._todo_cache.get(todo_id)
+        
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < TODO_CACHE_FRESH_SECONDS:
+                return entry[1]
+            if age < TODO_CACHE_STALE_SECONDS:
+                self._start_revalidation(todo_id)
+                return entry[1]
+        
+        return self._request_todo(todo_id)
+    
+    def _request_todo(self, todo_id: str) -> Dict[str, Any]:
+        """Fetch a todo item from the Todo Server and store it in the cache."""
         try:
-            response = requests.get(f"{self.todo_server_url}/api/todos/{todo_id}")
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return self._download_todo(todo_id)
+        # A malformed body raises the decoder's ValueError, not a RequestException
+        except (requests.RequestException, ValueError) as e:
             raise Exception(f"Failed to fetch todo: {str(e)}")
     
+    def _download_todo(self, todo_id: str) -> Dict[str, Any]:
+        """Fetch and cache a todo item, letting request and decoding errors propagate."""
+        response = self._session.get(
+            f"{self.todo_server_url}/api/todos/{todo_id}",
+            timeout=REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        todo_data = _json_loads(response.content)
+        
+        now = time.monotonic()
+        with self._todo_cache_lock:
+            # Expired entries would otherwise stay until their ID is fetched
+            # again, so the cache would grow with every distinct todo
+            expired = [
+                cached_id for cached_id, (fetched_at, _) in self._todo_cache.items()
+                if now - fetched_at >= TODO_CACHE_STALE_SECONDS
+            ]
+            for cached_id in expired:
+                del self._todo_cache[cached_id]
+            self._todo_cache[todo_id] = (now, todo_data)
+        return todo_data
+    
+    def _start_revalidation(self, todo_id: str) -> None:
+        """Refresh a stale todo in the background, at most once at a time per ID."""
+        with self._todo_cache_lock:
+            if todo_id in self._revalidating:
+                return
+            self._revalidating.add(todo_id)
+        
+        threading.Thread(target=self._revalidate_todo, args=(todo_id,), daemon=True).start()
+    
+    def _revalidate_todo(self, todo_id: str) -> None:
+        """Re-fetch a todo, keeping the stale entry if the Todo Server fails."""
+        try:
+            self._download_todo(todo_id)
+        except (requests.RequestException, ValueError):
+            pass
+        finally:
+            with self._todo_cache_lock:
+                self._revalidating.discard(todo_id)
+    
     def _create_project_prompt(self, todo_data: Dict[str, Any]) -> str:
         """Create a prompt for Gemma based on the todo data."""
         description = todo_data.get("description", "")
         project = todo_data.get("project", "")
         metadata = todo_data.get("metadata", {})
+        context = json.dumps(metadata, indent=2) if metadata else "No additional context provided."
         
-        prompt = f"""
-        Generate a project structure based on the following TODO item:
-        
-        Description: {description}
-        Project: {project}
-        
-        Additional context:
-        {json.dumps(metadata, indent=2) if metadata else "No additional context provided."}
-        
-        Your task is to determine:
-        1. An appropriate project name (in kebab-case format)
-        2. A concise project description
-        3. The most suitable project type (python, rust, or common)
-        4. Any additional details needed for the project setup
-        
-        Please use the function calling to provide structured output.
-        """
-        
-        return prompt
+        # Keyed on the rendered text: equal-hashing values such as 1 and True
+        # would otherwise share a cached prompt, and lists aren't hashable
+        return _prompt_for(str(description), str(project), context)
     
     def _call_gemma_function(self, prompt: str, function_schema: Dict[str, Any]) -> Dict[str, Any]:
         """Call Gemma's function calling API."""
@@ -135,14 +301,16 @@ class GemmaProjectClient:
         }
         
         try:
-            response = requests.post(
+            # The session already sends Content-Type: application/json, so the
+            # body is serialized directly instead of through requests' json=
+            response = self._session.post(
                 f"{self.base_url}/chat/completions",
-                headers=self.headers,
-                json=payload
+                data=_json_dumps(payload),
+                timeout=REQUEST_TIMEOUT
             )
             response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return _json_loads(response.content)
+        except (requests.RequestException, ValueError) as e:
             raise Exception(f"Failed to call Gemma API: {str(e)}")
 
 
@@ -150,6 +318,9 @@ class GemmaProjectClient:
 class MockGemmaProjectClient(GemmaProjectClient):
     """Mock implementation of the Gemma client for testing."""
     
+    # Mock responses are generated locally, so there is nothing to save by caching
+    _cache_results = False
+    
     def __init__(self):
         super().__init__("mock_api_key")
     
@@ -169,32 +340,31 @@ class MockGemmaProjectClient(GemmaProjectClient):
     def _call_gemma_function(self, prompt: str, function_schema: Dict[str, Any]) -> Dict[str, Any]:
         """Mock Gemma API response with more intelligent parsing."""
         # Extract meaningful info from the prompt
-        import re
-        description_match = re.search(r"Description: (.*?)(?:\n|$)", prompt)
-        project_match = re.search(r"Project: (.*?)(?:\n|$)", prompt)
+        description_match = _DESC_RE.search(prompt)
+        project_match = _PROJ_RE.search(prompt)
         
         description = description_match.group(1) if description_match else "AI-Generated Test Project"
         project = project_match.group(1) if project_match else "test-project"
         
         # Create a more realistic project name from the description
-        name = description.lower()
-        name = re.sub(r'[^a-z0-9\s-]', '', name)  # Remove special chars
-        name = re.sub(r'\s+', '-', name)  # Replace spaces with hyphens
+        lowered = description.lower()
+        name = _CLEAN_RE.sub('', lowered)  # Remove special chars
+        name = _WS_RE.sub('-', name)  # Replace spaces with hyphens
         name = name[:30]  # Limit length
         if not name:
-            name = f"generated-project-{hash(description) % 1000}"
+            name = f"generated-project-{zlib.crc32(description.encode('utf-8')) % 1000}"
 
         # Determine project type based on keywords
         project_type = "python"
-        if any(word in description.lower() for word in ["rust", "cargo", "rustc"]):
+        if any(word in lowered for word in ("rust", "cargo", "rustc")):
             project_type = "rust"
-        elif any(word in description.lower() for word in ["web", "html", "css", "js"]):
+        elif any(word in lowered for word in ("web", "html", "css", "js")):
             project_type = "common"
         
         return {
             "function_call": {
                 "name": "generate_project_structure",
-                "arguments": json.dumps({
+                "arguments": _json_dumps({
                     "name": name,
                     "description": description,
                     "project_type": project_type,
@@ -203,6 +373,6 @@ class MockGemmaProjectClient(GemmaProjectClient):
                         "testing_framework": "pytest" if project_type == "python" else "cargo test",
                         "generated_by": "spindlewrit_mock_client"
                     }
-                })
+                }).decode()
             }
         } 
@@ -1,15 +1,150 @@
 import os
+import posixpath
+import re
 import shutil
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from .models import ProjectConfig, ProjectResponse, ProjectType
 
 
+# Flags for creating/truncating generated files (O_BINARY keeps Windows from
+# translating newlines)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# Manifests smaller than this are written inline instead of on the I/O pool
+_POOL_MIN_FILES = 3
+
+# Seconds to wait for `cargo init` before giving up
+CARGO_TIMEOUT = 60
+
+# File templates are stored as UTF-8 bytes; each project value is encoded
+# once and substituted with bytes %-formatting, so no text is re-encoded
+_PYTHON_SETUP_TMPL = b"""from setuptools import setup, %(find_packages)s
+
+setup(
+    name="%(name)s",
+    version="0.1.0",
+    packages=%(find_packages)s(where="src"),
+    package_dir={"": "src"},
+    install_requires=[],
+    python_requires=">=3.8",
+)"""
+
+_PYTHON_TEST_TMPL = b"""import unittest
+from %(name)s import __version__
+
+class Test%(class_name)s(unittest.TestCase):
+    def test_version(self):
+        self.assertTrue(__version__)
+
+if __name__ == '__main__':
+    unittest.main()
+"""
+
+_README_HEADER_TMPL = b"""# %(name)s
+
+%(description)s
+
+## Overview
+
+This is a %(project_type)s project created with the Project Generator tool.
+
+## Setup
+
+"""
+
+_README_PYTHON_FOOTER = b"""
+1. Create and activate a virtual environment:
+   ```bash
+   python -m venv venv
+   source venv/bin/activate  # On Windows: venv\\Scripts\\activate
+   ```
+2. Install dependencies:
+   ```bash
+   pip install -r requirements.txt
+   ```
+"""
+
+_README_RUST_FOOTER = b"""
+1. Build the project:
+   ```bash
+   cargo build
+   ```
+2. Run tests:
+   ```bash
+   cargo test
+   ```
+"""
+
+# Package names: ASCII letters, digits, "-" and "_", not starting with a
+# digit. Cargo also allows non-ASCII letters; these are kept out on purpose.
+# Such a name needs no escaping inside Cargo.toml
+_RUST_PACKAGE_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*\Z")
+
+# Names `cargo init` refuses even though their characters are fine: Rust
+# keywords, the built-in test crate and cargo's own build directories
+_RUST_RESERVED_NAMES = frozenset({
+    "Self", "abstract", "as", "async", "await", "become", "box", "break",
+    "const", "continue", "crate", "do", "dyn", "else", "enum", "extern",
+    "false", "final", "fn", "for", "if", "impl", "in", "let", "loop", "macro",
+    "match", "mod", "move", "mut", "override", "priv", "pub", "ref", "return",
+    "self", "static", "struct", "super", "trait", "true", "try", "type",
+    "typeof", "unsafe", "unsized", "use", "virtual", "where", "while", "yield",
+    "test",
+    "build", "deps", "examples", "incremental",
+})
+
+# Rust files matching what `cargo init` writes
+_CARGO_TOML_TMPL = b"""[package]
+name = "%(name)s"
+version = "0.1.0"
+edition = "2021"
+
+[dependencies]
+"""
+
+_RUST_MAIN = b"""fn main() {
+    println!("Hello, world!");
+}
+"""
+
+_RUST_GITIGNORE = b"/target\n"
+
+# Complete README template per project type, so rendering is a single
+# %-format producing the final bytes object
+_README_TMPLS = {
+    "python": _README_HEADER_TMPL + _README_PYTHON_FOOTER,
+    "rust": _README_HEADER_TMPL + _README_RUST_FOOTER,
+    "common": _README_HEADER_TMPL,
+}
+
+
 class ProjectGenerator:
+    # Shared pool for overlapping independent file writes (the GIL is
+    # released during the write syscalls)
+    _io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pg-io")
+
     def __init__(self):
-        pass
+        # Per-run state lives on a thread-local, so one generator can serve
+        # generate_project calls from several threads at once
+        self._run = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the calling thread's per-run state.
+
+        This lets the generator be reused for another project.
+        """
+        run = self._run
+        # Directories known to exist during the current generate_project run
+        run.seendirs = set()
+        # Dry runs collect the rendered files here instead of writing them
+        run.dry_root: Optional[str] = None
+        run.dry_files: Optional[Dict[str, bytes]] = None
 
     def generate_project(self, config: ProjectConfig) -> ProjectResponse:
         """
@@ -22,23 +157,29 @@ class ProjectGenerator:
             ProjectResponse with status and details
         """
         try:
-            project_path = Path(config.path)
-            
+            self.reset()
+            if config.dry_run:
+                self._run.dry_root = os.fspath(config.path)
+                self._run.dry_files = {}
+
             # Create the project directory if it doesn't exist
-            os.makedirs(project_path, exist_ok=True)
+            self._ensure_dir(config.path)
             
             # Generate project based on type
-            if config.project_type == ProjectType.PYTHON:
-                self._generate_python_project(config, project_path)
-            elif config.project_type == ProjectType.RUST:
-                self._generate_rust_project(config, project_path)
-            else:
-                self._generate_common_project(config, project_path)
-                
+            handler = self._GENERATORS.get(config.project_type, ProjectGenerator._generate_common_project)
+            handler(self, config, config.path)
+            
+            if config.dry_run:
+                return ProjectResponse(
+                    success=True,
+                    message=f"Rendered {config.project_type} project (dry run): {config.name}",
+                    project_path=str(config.path),
+                    files=self._run.dry_files
+                )
             return ProjectResponse(
                 success=True,
                 message=f"Successfully created {config.project_type} project: {config.name}",
-                project_path=str(project_path)
+                project_path=str(config.path)
             )
         
         except Exception as e:
@@ -50,118 +191,188 @@ class ProjectGenerator:
     
     def _generate_python_project(self, config: ProjectConfig, path: Path) -> None:
         """Generate a Python project structure."""
-        # Create project structure
         src_dir = path / "src"
-        os.makedirs(src_dir, exist_ok=True)
-        os.makedirs(src_dir / config.name, exist_ok=True)
-        os.makedirs(src_dir / "tests", exist_ok=True)
-
-        # Create __init__.py files
-        self._write_file(src_dir / config.name / "__init__.py", "")
-        self._write_file(src_dir / "tests" / "__init__.py", "")
-
-        # Create requirements.txt
-        self._write_file(path / "requirements.txt", "# Core dependencies\n")
-
-        # Create setup.py
-        setup_content = f"""from setuptools import setup, find_packages
-
-setup(
-    name="{config.name}",
-    version="0.1.0",
-    packages=find_packages(where="src"),
-    package_dir={{"": "src"}},
-    install_requires=[],
-    python_requires=">=3.8",
-)"""
-        self._write_file(path / "setup.py", setup_content)
+        package_dir = src_dir / config.name
+        tests_dir = src_dir / "tests"
 
-        # Create README.md
-        self._create_readme(config, path, "python")
-        
-        # Create a simple test file
-        test_content = f"""import unittest
-from {config.name} import __version__
+        subs = self._template_values(config)
+        # Namespace packages (PEP 420) are only discovered by find_namespace_packages
+        subs[b"find_packages"] = b"find_packages" if config.legacy_packages else b"find_namespace_packages"
+        setup_content = _PYTHON_SETUP_TMPL % subs
+        test_content = _PYTHON_TEST_TMPL % subs
 
-class Test{config.name.capitalize()}(unittest.TestCase):
-    def test_version(self):
-        self.assertTrue(__version__)
-
-if __name__ == '__main__':
-    unittest.main()
-"""
-        self._write_file(src_dir / "tests" / f"test_{config.name}.py", test_content)
-        
-        # Create version file
-        self._write_file(src_dir / config.name / "__version__.py", '__version__ = "0.1.0"')
+        files: List[Tuple[Path, bytes]] = [
+            (path / "requirements.txt", b"# Core dependencies\n"),
+            (path / "setup.py", setup_content),
+            (tests_dir / f"test_{config.name}.py", test_content),
+            (package_dir / "__version__.py", b'__version__ = "0.1.0"'),
+            (path / "README.md", _README_TMPLS["python"] % subs),
+        ]
+        if config.legacy_packages:
+            files += [
+                (package_dir / "__init__.py", b""),
+                (tests_dir / "__init__.py", b""),
+            ]
+        self._emit_manifest(files)
 
     def _generate_rust_project(self, config: ProjectConfig, path: Path) -> None:
         """Generate a Rust project structure."""
+        # A dry run can't capture what cargo writes, so it renders the same
+        # files from the built-in templates
+        if not config.use_cargo or config.dry_run:
+            self._generate_rust_inline(config, path)
+            return
+
         try:
             # Use cargo to initialize the project
             subprocess.run(
                 ["cargo", "init", "--name", config.name],
                 cwd=path,
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=CARGO_TIMEOUT
             )
             
             # Create README.md
-            self._create_readme(config, path, "rust")
+            self._emit_manifest([(path / "README.md", self._render_readme(config, "rust"))])
             
         except subprocess.CalledProcessError as e:
-            raise Exception(f"Failed to initialize Rust project: {e.stderr.decode()}")
+            # stderr is None when the error didn't come from our PIPE'd run
+            detail = e.stderr.decode(errors="replace") if e.stderr else f"cargo exited with status {e.returncode}"
+            raise Exception(f"Failed to initialize Rust project: {detail}")
+        except subprocess.TimeoutExpired:
+            raise Exception(f"Failed to initialize Rust project: cargo timed out after {CARGO_TIMEOUT} seconds")
+
+    def _generate_rust_inline(self, config: ProjectConfig, path: Path) -> None:
+        """Generate a Rust project structure without running cargo."""
+        # cargo init refuses these names, so the inline path must too
+        if not _RUST_PACKAGE_NAME.match(config.name):
+            raise Exception(
+                f"Invalid Rust package name {config.name!r}: use ASCII letters, digits, "
+                "'-' and '_', not starting with a digit"
+            )
+        if config.name in _RUST_RESERVED_NAMES:
+            raise Exception(f"Invalid Rust package name {config.name!r}: the name is reserved")
+        cargo_toml = _CARGO_TOML_TMPL % {b"name": config.name.encode()}
+        self._emit_manifest([
+            (path / "Cargo.toml", cargo_toml),
+            (path / "src" / "main.rs", _RUST_MAIN),
+            (path / ".gitignore", _RUST_GITIGNORE),
+            (path / "README.md", self._render_readme(config, "rust")),
+        ])
 
     def _generate_common_project(self, config: ProjectConfig, path: Path) -> None:
         """Generate a common project structure."""
-        os.makedirs(path / "src", exist_ok=True)
-        os.makedirs(path / "docs", exist_ok=True)
-        os.makedirs(path / "examples", exist_ok=True)
+        self._ensure_dir(path / "src")
+        self._ensure_dir(path / "docs")
+        self._ensure_dir(path / "examples")
 
         # Create README.md
-        self._create_readme(config, path, "common")
+        self._emit_manifest([(path / "README.md", self._render_readme(config, "common"))])
 
-    def _create_readme(self, config: ProjectConfig, path: Path, project_type: str) -> None:
-        """Create a README.md file for the project."""
-        content = f"""# {config.name}
+    def _template_values(self, config: ProjectConfig) -> Dict[bytes, bytes]:
+        """Encode the project's template substitutions once for every file."""
+        return {
+            b"name": config.name.encode(),
+            b"class_name": config.name.capitalize().encode(),
+            b"description": config.description.encode(),
+            b"project_type": config.project_type.value.encode()
+        }
 
-{config.description}
+    def _render_readme(self, config: ProjectConfig, project_type: str) -> bytes:
+        """Render the README.md content for the project."""
+        return _README_TMPLS[project_type] % self._template_values(config)
 
-## Overview
+    def _emit_manifest(self, files: List[Tuple[Path, bytes]]) -> None:
+        """Write a set of files, creating each parent directory only once.
 
-This is a {project_type} project created with the Project Generator tool.
+        Directories are created before any write, deepest first: one
+        os.makedirs call per leaf directory creates its missing ancestors
+        too, so shared prefixes are already recorded when their turn comes.
+        """
+        run = self._run
+        if run.dry_files is not None:
+            for file_path, data in files:
+                rel = self._dry_rel(file_path)
+                self._record_dry_dir(posixpath.dirname(rel))
+                run.dry_files[rel] = data
+            return
 
-## Setup
+        # A path is always longer than any of its ancestors
+        directories = {os.path.dirname(file_path) for file_path, _ in files}
+        for directory in sorted(directories, key=len, reverse=True):
+            self._ensure_dir(directory)
 
-"""
-        if project_type == "python":
-            content += """
-1. Create and activate a virtual environment:
-   ```bash
-   python -m venv venv
-   source venv/bin/activate  # On Windows: venv\\Scripts\\activate
-   ```
-2. Install dependencies:
-   ```bash
-   pip install -r requirements.txt
-   ```
-"""
-        elif project_type == "rust":
-            content += """
-1. Build the project:
-   ```bash
-   cargo build
-   ```
-2. Run tests:
-   ```bash
-   cargo test
-   ```
-"""
+        # Handing one or two files to the pool costs more than writing them
+        if len(files) < _POOL_MIN_FILES:
+            for file_path, data in files:
+                self._write_small(file_path, data)
+            return
 
-        self._write_file(path / "README.md", content)
-    
-    def _write_file(self, path: Path, content: str) -> None:
-        """Write content to a file, creating parent directories if needed."""
-        os.makedirs(path.parent, exist_ok=True)
-        with open(path, 'w') as f:
-            f.write(content) 
+        futures = [self._io_pool.submit(self._write_small, file_path, data) for file_path, data in files]
+        # Wait for every write, then surface the first failure in manifest order
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def _ensure_dir(self, path) -> None:
+        """Create a directory (and its parents) at most once per run.
+
+        Paths are expected to be normalized already (ProjectConfig normalizes
+        its path, and joins and dirname() of a normalized path stay so).
+        """
+        path = os.fspath(path)
+        run = self._run
+        if run.dry_files is not None:
+            self._record_dry_dir(self._dry_rel(path))
+            return
+        if path in run.seendirs:
+            return
+        os.makedirs(path, exist_ok=True)
+
+        # Every parent exists now too; stop at the first one already recorded
+        seendirs = run.seendirs
+        while path not in seendirs:
+            seendirs.add(path)
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+
+    def _dry_rel(self, path) -> str:
+        """Return path relative to the dry run's project, with "/" separators."""
+        return os.path.relpath(path, self._run.dry_root).replace(os.sep, "/")
+
+    def _record_dry_dir(self, rel: str) -> None:
+        """Record a directory and its missing ancestors in the dry-run files.
+
+        Directories are keyed with a trailing "/" and map to empty content;
+        the project directory itself isn't recorded.
+        """
+        dry_files = self._run.dry_files
+        while rel not in ("", ".") and rel + "/" not in dry_files:
+            dry_files[rel + "/"] = b""
+            rel = posixpath.dirname(rel)
+
+    def _write_small(self, path: Path, data: bytes) -> None:
+        """Write a small file whose parent directory already exists.
+
+        Goes straight to os.open/os.write, skipping the buffered io layers.
+        """
+        fd = os.open(path, _WRITE_FLAGS, 0o666)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+
+# Project type -> generator method, looked up once per generate_project call
+ProjectGenerator._GENERATORS = {
+    ProjectType.PYTHON: ProjectGenerator._generate_python_project,
+    ProjectType.RUST: ProjectGenerator._generate_rust_project,
+    ProjectType.COMMON: ProjectGenerator._generate_common_project,
+}
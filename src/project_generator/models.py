@@ -1,6 +1,24 @@
+import os
 from enum import Enum
+from pathlib import Path
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, field_validator
+
+
+# Byte -> 1 for the ASCII control characters (below 0x20, and DEL) a name
+# may not contain. UTF-8 never uses bytes below 0x80 inside multi-byte
+# sequences, so checking the encoded bytes is equivalent to checking the
+# code points.
+_NAME_FORBIDDEN_TABLE = bytes(1 if c < 0x20 or c == 0x7F else 0 for c in range(256))
+
+# Descriptions are free text, so only control characters other than tab,
+# LF and CR are rejected there
+_DESCRIPTION_FORBIDDEN_TABLE = bytes(1 if c < 0x20 and c not in (9, 10, 13) else 0 for c in range(256))
+
+
+def _has_forbidden_bytes(value: str, table: bytes) -> bool:
+    # bytes.translate maps every byte through the table in one C loop
+    return b"\x01" in value.encode("utf-8", "surrogatepass").translate(table)
 
 
 class ProjectType(str, Enum):
@@ -10,15 +28,48 @@ class ProjectType(str, Enum):
 
 
 class ProjectConfig(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     name: str
     description: str
     project_type: ProjectType
-    path: str
+    path: Path
     additional_details: Optional[Dict[str, Any]] = None
+    use_cargo: bool = False
+    # Write empty __init__.py files; False generates PEP 420 namespace packages
+    legacy_packages: bool = True
+    # Render the project into ProjectResponse.files instead of writing it
+    dry_run: bool = False
+
+    @field_validator("name")
+    @classmethod
+    def _reject_name_control_characters(cls, value: str) -> str:
+        # Names end up in file names and quoted strings in generated code
+        if _has_forbidden_bytes(value, _NAME_FORBIDDEN_TABLE):
+            raise ValueError("must not contain control characters")
+        return value
+
+    @field_validator("description")
+    @classmethod
+    def _reject_description_control_characters(cls, value: str) -> str:
+        if _has_forbidden_bytes(value, _DESCRIPTION_FORBIDDEN_TABLE):
+            raise ValueError("must not contain control characters")
+        return value
+
+    @field_validator("path")
+    @classmethod
+    def _normalize_path(cls, value: Path) -> Path:
+        # Normalized once here so the generator can use config.path as-is
+        return Path(os.path.normpath(value))
 
 
 class ProjectResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     success: bool
     message: str
     project_path: Optional[str] = None
-    errors: Optional[List[str]] = None 
+    errors: Optional[List[str]] = None
+    # Dry runs only: "/"-separated path relative to the project -> file
+    # content; directories are keyed with a trailing "/" and map to b""
+    files: Optional[Dict[str, bytes]] = None 
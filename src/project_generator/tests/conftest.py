@@ -0,0 +1,75 @@
+"""pytest configuration shared by the Spindlewrit test suite."""
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, create_autospec
+
+import pytest
+
+from project_generator.generator import ProjectGenerator
+
+
+# RAM-backed filesystem used for test directories when available
+_RAM_TEMPROOT = "/dev/shm"
+
+
+def pytest_configure(config):
+    """Pick the temporary directory roots for the run.
+
+    Unless TMPDIR already chooses one, temporary directories (tmp_path
+    included) go to tmpfs when the platform has it, since the suite spends
+    most of its time creating and removing small files. Each pytest-xdist
+    worker also gets its own temporary directory, so workers never share a
+    tempfile root and a worker's leftovers are easy to tell apart when a
+    run is interrupted.
+    """
+    if "TMPDIR" not in os.environ and os.access(_RAM_TEMPROOT, os.W_OK):
+        tempfile.tempdir = _RAM_TEMPROOT
+
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker is None:
+        return
+    config._spindlewrit_tempdir = tempfile.mkdtemp(prefix=f"spindlewrit-{worker}-")
+    tempfile.tempdir = config._spindlewrit_tempdir
+
+
+def pytest_unconfigure(config):
+    """Restore the default temporary directory and remove the worker's one."""
+    tempfile.tempdir = None
+    worker_tempdir = getattr(config, "_spindlewrit_tempdir", None)
+    if worker_tempdir is not None:
+        shutil.rmtree(worker_tempdir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def generator():
+    """One ProjectGenerator for the whole session; generate_project resets it per run."""
+    return ProjectGenerator()
+
+
+@pytest.fixture
+def fake_dir(fs):
+    """A project directory on a pyfakefs filesystem.
+
+    For tests that only check what the generator creates, never how the
+    real filesystem treats it; nothing touches the disk.
+    """
+    fs.create_dir("/project")
+    # A Path rather than a str: pydantic converts str with the real
+    # pathlib.Path, which doesn't work while pyfakefs is active
+    return Path("/project")
+
+
+@pytest.fixture
+def mock_subprocess_run(monkeypatch):
+    """Replace subprocess.run with a mock that reports success.
+
+    The mock is autospecced, so calls that subprocess.run itself would
+    reject fail here too. Tests that need a failure set side_effect on the
+    returned mock.
+    """
+    mock_run = create_autospec(subprocess.run, return_value=MagicMock(returncode=0))
+    monkeypatch.setattr("subprocess.run", mock_run)
+    return mock_run
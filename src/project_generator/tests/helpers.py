@@ -0,0 +1,96 @@
+"""Shared helpers for the Spindlewrit test suite."""
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from project_generator.models import ProjectConfig, ProjectType
+
+
+def tree(root):
+    """Return the relative paths of every file and directory under root.
+
+    Paths use "/" separators on every platform. One os.walk reads each
+    directory once, instead of a stat() per os.path.exists assertion.
+    """
+    paths = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        prefix = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        prefix = "" if prefix == "." else prefix + "/"
+        paths.update(prefix + name for name in dirnames)
+        paths.update(prefix + name for name in filenames)
+    return paths
+
+
+# Validated once; make_config copies it for each test
+_BASE_CONFIG = ProjectConfig(
+    name="project",
+    description="A generated project",
+    project_type=ProjectType.PYTHON,
+    path="/project"
+)
+
+
+def make_config(**overrides):
+    """Return a Python-project ProjectConfig with the given fields replaced.
+
+    model_copy skips validation, so this is for tests whose values are
+    already valid; path must be a normalized Path. Tests about validation
+    or path handling construct ProjectConfig directly.
+    """
+    return _BASE_CONFIG.model_copy(update=overrides)
+
+
+def entries(root):
+    """Return the names directly inside root, read with a single scandir."""
+    with os.scandir(root) as it:
+        return {entry.name for entry in it}
+
+
+_MISSING = object()
+
+
+@contextmanager
+def swap(obj, name, replacement):
+    """Temporarily replace obj.name with a plain stand-in.
+
+    A lighter alternative to mock.patch.object for stubs that don't need
+    call recording. An attribute that only existed on the class (such as a
+    method swapped on an instance) is removed again rather than restored.
+    """
+    original = vars(obj).get(name, _MISSING)
+    setattr(obj, name, replacement)
+    try:
+        yield replacement
+    finally:
+        if original is _MISSING:
+            delattr(obj, name)
+        else:
+            setattr(obj, name, original)
+
+
+class TempDirMixin:
+    """Give each test its own directory under one per-class root.
+
+    The directory is available as a string in self.test_dir and as a Path in
+    self.root.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the temporary root directory shared by the class's tests."""
+        super().setUpClass()
+        cls._root = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary root directory and every test directory in it."""
+        shutil.rmtree(cls._root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        """Create the test's directory inside the class root."""
+        super().setUp()
+        self.test_dir = tempfile.mkdtemp(prefix=self._testMethodName + "-", dir=self._root)
+        self.root = Path(self.test_dir)
@@ -1,8 +1,18 @@
 import json
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 
-from project_generator.gemma_integration import GemmaProjectClient, MockGemmaProjectClient
+import requests
+
+from project_generator.gemma_integration import (
+    GemmaProjectClient,
+    MockGemmaProjectClient,
+    REQUEST_TIMEOUT,
+    TODO_CACHE_FRESH_SECONDS,
+    TODO_CACHE_STALE_SECONDS,
+)
+from project_generator.tests.helpers import swap
 
 
 class TestGemmaProjectClient(unittest.TestCase):
@@ -37,12 +47,12 @@ class TestGemmaProjectClient(unittest.TestCase):
             }
         }
 
-    @patch('project_generator.gemma_integration.requests.get')
+    @patch('project_generator.gemma_integration.requests.Session.get')
     def test_fetch_todo(self, mock_get):
         """Test fetching a todo item."""
         # Configure mock
         mock_response = MagicMock()
-        mock_response.json.return_value = self.mock_todo_data
+        mock_response.content = json.dumps(self.mock_todo_data).encode()
         mock_response.raise_for_status = MagicMock()
         mock_get.return_value = mock_response
         
@@ -51,9 +61,62 @@ class TestGemmaProjectClient(unittest.TestCase):
         
         # Assert the result
         self.assertEqual(result, self.mock_todo_data)
-        mock_get.assert_called_once_with(f"{self.client.todo_server_url}/api/todos/123")
+        mock_get.assert_called_once_with(
+            f"{self.client.todo_server_url}/api/todos/123",
+            timeout=REQUEST_TIMEOUT
+        )
+
+    @patch('project_generator.gemma_integration.requests.Session.get')
+    def test_fetch_todo_cached(self, mock_get):
+        """Test that a fresh cached todo is returned without another request."""
+        mock_response = MagicMock()
+        mock_response.content = json.dumps(self.mock_todo_data).encode()
+        mock_get.return_value = mock_response
+        
+        first = self.client._fetch_todo("123")
+        second = self.client._fetch_todo("123")
+        
+        self.assertEqual(first, second)
+        mock_get.assert_called_once()
+
+    @patch('project_generator.gemma_integration.requests.Session.get')
+    def test_fetch_todo_stale_while_revalidate(self, mock_get):
+        """Test that a stale todo is served while a failed refresh keeps it cached."""
+        stale_at = time.monotonic() - TODO_CACHE_FRESH_SECONDS - 1
+        self.client._todo_cache["123"] = (stale_at, self.mock_todo_data)
+        mock_get.side_effect = requests.ConnectionError("Todo Server down")
+        
+        with patch.object(self.client, '_start_revalidation') as mock_revalidate:
+            result = self.client._fetch_todo("123")
+        
+        self.assertEqual(result, self.mock_todo_data)
+        mock_revalidate.assert_called_once_with("123")
+        
+        # A failed background refresh must not evict the stale entry
+        self.client._revalidate_todo("123")
+        self.assertEqual(self.client._todo_cache["123"], (stale_at, self.mock_todo_data))
+        self.assertNotIn("123", self.client._revalidating)
+
+    def test_revalidate_todo_propagates_unexpected_errors(self):
+        """Test that only Todo Server failures are swallowed by a background refresh."""
+        with patch.object(self.client, '_download_todo', side_effect=KeyError("bug")):
+            with self.assertRaises(KeyError):
+                self.client._revalidate_todo("123")
+        
+        self.assertNotIn("123", self.client._revalidating)
+
+    @patch('project_generator.gemma_integration.requests.Session.get')
+    def test_fetch_todo_evicts_expired_entries(self, mock_get):
+        """Test that expired todos are dropped when another todo is fetched."""
+        expired_at = time.monotonic() - TODO_CACHE_STALE_SECONDS - 1
+        self.client._todo_cache["old"] = (expired_at, {"id": "old"})
+        mock_get.return_value.content = json.dumps(self.mock_todo_data).encode()
+        
+        self.client._fetch_todo("123")
+        
+        self.assertEqual(set(self.client._todo_cache), {"123"})
 
-    @patch('project_generator.gemma_integration.requests.get')
+    @patch('project_generator.gemma_integration.requests.Session.get')
     def test_fetch_todo_exception(self, mock_get):
         """Test fetching a todo item with an exception."""
         # Configure mock to raise an exception
@@ -66,6 +129,17 @@ class TestGemmaProjectClient(unittest.TestCase):
         # Check exception message
         self.assertIn("Failed to fetch todo", str(context.exception))
 
+    @patch('project_generator.gemma_integration.requests.Session.get')
+    def test_fetch_todo_non_json_body(self, mock_get):
+        """Test that a non-JSON body is reported as a failed fetch."""
+        mock_get.return_value.content = b"<html>Bad Gateway</html>"
+        
+        with self.assertRaises(Exception) as context:
+            self.client._fetch_todo("123")
+        
+        self.assertIn("Failed to fetch todo", str(context.exception))
+        self.assertNotIn("123", self.client._todo_cache)
+
     def test_create_project_prompt(self):
         """Test creating a project prompt from todo data."""
         prompt = self.client._create_project_prompt(self.mock_todo_data)
@@ -75,12 +149,26 @@ class TestGemmaProjectClient(unittest.TestCase):
         self.assertIn(self.mock_todo_data["project"], prompt)
         self.assertIn("requirements", prompt)  # Should include metadata
 
-    @patch('project_generator.gemma_integration.requests.post')
+    def test_create_project_prompt_unhashable_fields(self):
+        """Test that non-string todo fields are rendered as text."""
+        prompt = self.client._create_project_prompt({"description": ["a", "b"], "project": {"x": 1}})
+
+        self.assertIn("Description: ['a', 'b']", prompt)
+        self.assertIn("No additional context provided.", prompt)
+
+    def test_create_project_prompt_equal_hashing_fields(self):
+        """Test that values that hash alike don't share a cached prompt."""
+        self.client._create_project_prompt({"description": 1})
+        
+        self.assertIn("Description: True", self.client._create_project_prompt({"description": True}))
+        self.assertIn("Description: 1.0", self.client._create_project_prompt({"description": 1.0}))
+
+    @patch('project_generator.gemma_integration.requests.Session.post')
     def test_call_gemma_function(self, mock_post):
         """Test calling the Gemma function."""
         # Configure mock
         mock_response = MagicMock()
-        mock_response.json.return_value = self.mock_gemma_response
+        mock_response.content = json.dumps(self.mock_gemma_response).encode()
         mock_response.raise_for_status = MagicMock()
         mock_post.return_value = mock_response
         
@@ -90,12 +178,18 @@ class TestGemmaProjectClient(unittest.TestCase):
         # Assert the result
         self.assertEqual(result, self.mock_gemma_response)
         mock_post.assert_called_once()
+        _, kwargs = mock_post.call_args
+        
+        # Verify the session carries the auth header and the call has a timeout
+        self.assertEqual(self.client._session.headers["Authorization"], f"Bearer {self.api_key}")
+        self.assertEqual(kwargs["timeout"], REQUEST_TIMEOUT)
         
-        # Verify headers were set correctly
-        call_args = mock_post.call_args[1]
-        self.assertEqual(call_args["headers"]["Authorization"], f"Bearer {self.api_key}")
+        # The payload is sent pre-serialized
+        payload = json.loads(kwargs["data"])
+        self.assertEqual(payload["messages"][0]["content"], "test prompt")
+        self.assertEqual(payload["tool_choice"]["function"]["name"], "test_function")
 
-    @patch('project_generator.gemma_integration.requests.post')
+    @patch('project_generator.gemma_integration.requests.Session.post')
     def test_call_gemma_function_exception(self, mock_post):
         """Test calling the Gemma function with an exception."""
         # Configure mock to raise an exception
@@ -108,25 +202,82 @@ class TestGemmaProjectClient(unittest.TestCase):
         # Check exception message
         self.assertIn("Failed to call Gemma API", str(context.exception))
 
-    @patch.object(GemmaProjectClient, '_fetch_todo')
-    @patch.object(GemmaProjectClient, '_call_gemma_function')
-    def test_generate_from_todo(self, mock_call_gemma, mock_fetch_todo):
-        """Test generating project details from a todo."""
-        # Configure mocks
-        mock_fetch_todo.return_value = self.mock_todo_data
-        mock_call_gemma.return_value = self.mock_gemma_response
+    @patch('project_generator.gemma_integration.requests.Session.post')
+    def test_call_gemma_function_non_json_body(self, mock_post):
+        """Test that a non-JSON body is reported as a failed Gemma call."""
+        mock_post.return_value.content = b"<html>Bad Gateway</html>"
         
-        # Call the method
-        result = self.client.generate_from_todo("123")
+        with self.assertRaises(Exception) as context:
+            self.client._call_gemma_function("test prompt", {"name": "test_function"})
+        
+        self.assertIn("Failed to call Gemma API", str(context.exception))
+
+    def test_session_reused_across_calls(self):
+        """Test that the client keeps one pooled session for all requests."""
+        session = self.client._session
+        self.assertIs(session.get_adapter("https://api.gemma.ai"), session.get_adapter("http://localhost"))
+        
+        with patch.object(session, 'close') as mock_close:
+            self.client.close()
+            mock_close.assert_called_once()
+
+    def test_context_manager_closes_session(self):
+        """Test that leaving a with block closes the client's session."""
+        with patch.object(requests.Session, 'close') as mock_close:
+            with GemmaProjectClient("test_api_key") as client:
+                self.assertIsInstance(client, GemmaProjectClient)
+            mock_close.assert_called_once()
+
+    def test_generate_from_todo(self):
+        """Test generating project details from a todo."""
+        # Plain stubs that record their arguments
+        fetched, calls = [], []
+
+        def fetch_todo(todo_id):
+            fetched.append(todo_id)
+            return self.mock_todo_data
+
+        def call_gemma(prompt, function_schema):
+            calls.append((prompt, function_schema))
+            return self.mock_gemma_response
+
+        with swap(self.client, '_fetch_todo', fetch_todo), \
+                swap(self.client, '_call_gemma_function', call_gemma):
+            result = self.client.generate_from_todo("123")
         
         # Assert the result
         self.assertEqual(result["name"], "data-analysis-tool")
         self.assertEqual(result["project_type"], "python")
         self.assertIn("dependencies", result["additional_details"])
         
-        # Verify mocks were called correctly
-        mock_fetch_todo.assert_called_once_with("123")
+        # Verify the stubs were called correctly
+        self.assertEqual(fetched, ["123"])
+        self.assertEqual(len(calls), 1)
+        self.assertIs(calls[0][1], GemmaProjectClient._FUNCTION_SCHEMA)
+
+        # The instance no longer shadows the class methods
+        self.assertNotIn('_fetch_todo', vars(self.client))
+        self.assertNotIn('_call_gemma_function', vars(self.client))
+
+    @patch.object(GemmaProjectClient, '_fetch_todo')
+    @patch.object(GemmaProjectClient, '_call_gemma_function')
+    def test_generate_from_todo_result_cache(self, mock_call_gemma, mock_fetch_todo):
+        """Test that unchanged todo content reuses the previous Gemma result."""
+        mock_fetch_todo.return_value = self.mock_todo_data
+        mock_call_gemma.return_value = self.mock_gemma_response
+        
+        first = self.client.generate_from_todo("123")
+        first["name"] = "mutated-by-caller"
+        second = self.client.generate_from_todo("123")
+        
+        # The cached result is isolated from caller mutations
+        self.assertEqual(second["name"], "data-analysis-tool")
         mock_call_gemma.assert_called_once()
+        
+        # Clearing the cache forces a new Gemma call
+        self.client.clear_cache()
+        self.client.generate_from_todo("123")
+        self.assertEqual(mock_call_gemma.call_count, 2)
 
     @patch.object(GemmaProjectClient, '_fetch_todo')
     def test_generate_from_todo_missing_todo(self, mock_fetch_todo):
@@ -199,6 +350,16 @@ class TestMockGemmaProjectClient(unittest.TestCase):
         self.assertEqual(arguments["name"], "sample-project")
         self.assertEqual(arguments["description"], "Sample Project")
 
+    def test_mock_fallback_name_is_deterministic(self):
+        """Test that descriptions without usable characters get a stable name."""
+        test_prompt = "Description: !!!\nProject: Testing"
+        result = self.mock_client._call_gemma_function(test_prompt, {})
+        
+        arguments = json.loads(result["function_call"]["arguments"])
+        
+        # crc32("!!!") % 1000, independent of PYTHONHASHSEED
+        self.assertEqual(arguments["name"], "generated-project-872")
+
     @patch.object(MockGemmaProjectClient, '_fetch_todo')
     def test_mock_generate_from_todo(self, mock_fetch_todo):
         """Test the end-to-end flow with the mock client."""
@@ -1,230 +1,368 @@
-import os
-import tempfile
-import shutil
-import unittest
 import subprocess
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from project_generator.models import ProjectConfig, ProjectType, ProjectResponse
-from project_generator.generator import ProjectGenerator
-
-
-class TestProjectGenerator(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory for testing
-        self.test_dir = tempfile.mkdtemp()
-        self.generator = ProjectGenerator()
-    
-    def tearDown(self):
-        # Clean up the temporary directory
-        shutil.rmtree(self.test_dir)
-    
-    def test_python_project_generation(self):
-        """Test Python project generation."""
-        config = ProjectConfig(
-            name="test-project",
-            description="A test Python project",
-            project_type=ProjectType.PYTHON,
-            path=self.test_dir
-        )
-        
-        result = self.generator.generate_project(config)
-        
-        # Check if the generation was successful
-        self.assertTrue(result.success)
-        self.assertTrue(os.path.exists(self.test_dir))
-        
-        # Check if essential files were created
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "README.md")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "requirements.txt")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "setup.py")))
-        
-        # Check if source directories were created
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "src")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "src", "test-project")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "src", "tests")))
-        
-        # Check if __init__.py files were created
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "src", "test-project", "__init__.py")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "src", "tests", "__init__.py")))
-        
-        # Check if version file was created
-        version_file = os.path.join(self.test_dir, "src", "test-project", "__version__.py")
-        self.assertTrue(os.path.exists(version_file))
-        
-        # Verify file contents
-        with open(os.path.join(self.test_dir, "setup.py"), 'r') as f:
-            setup_content = f.read()
-            self.assertIn(f'name="{config.name}"', setup_content)
-            self.assertIn('version="0.1.0"', setup_content)
-            
-        with open(os.path.join(self.test_dir, "README.md"), 'r') as f:
-            readme_content = f.read()
-            self.assertIn(config.name, readme_content)
-            self.assertIn(config.description, readme_content)
-            self.assertIn("python", readme_content.lower())
-            
-        # Verify test file was created
-        test_file = os.path.join(self.test_dir, "src", "tests", f"test_{config.name}.py")
-        self.assertTrue(os.path.exists(test_file))
-        
-        # Check test file content
-        with open(test_file, 'r') as f:
-            test_content = f.read()
-            self.assertIn("import unittest", test_content)
-            self.assertIn(f"from {config.name} import __version__", test_content)
-            self.assertIn(f"class Test{config.name.capitalize()}", test_content)
-
-    def test_python_project_with_additional_details(self):
-        """Test Python project generation with additional details."""
-        config = ProjectConfig(
-            name="advanced-project",
-            description="An advanced Python project with custom details",
-            project_type=ProjectType.PYTHON,
-            path=self.test_dir,
-            additional_details={
-                "dependencies": ["requests", "pydantic", "click"]
-            }
-        )
-        
-        result = self.generator.generate_project(config)
-        
-        # Check if the generation was successful
-        self.assertTrue(result.success)
-        
-        # Additional verification should go here if the generator uses additional_details
-        # This is a placeholder as we may enhance the generator to use additional_details in the future
-    
-    @patch('subprocess.run')
-    def test_rust_project_generation(self, mock_run):
-        """Test Rust project generation."""
-        # Mock the subprocess.run call to avoid actual cargo command execution
-        mock_process = MagicMock()
-        mock_process.returncode = 0
-        mock_run.return_value = mock_process
-        
-        config = ProjectConfig(
-            name="test-rust",
-            description="A test Rust project",
-            project_type=ProjectType.RUST,
-            path=self.test_dir
-        )
-        
-        result = self.generator.generate_project(config)
-        
-        # Check if the generation was successful
-        self.assertTrue(result.success)
-        
-        # Verify cargo was called with correct parameters
-        mock_run.assert_called_once()
-        args, kwargs = mock_run.call_args
-        self.assertEqual(kwargs['cwd'], Path(self.test_dir))
-        self.assertEqual(args[0][0], "cargo")
-        self.assertEqual(args[0][1], "init")
-        self.assertEqual(args[0][3], config.name)
-        
-        # Check if README.md was created
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "README.md")))
-        
-        # Verify README content
-        with open(os.path.join(self.test_dir, "README.md"), 'r') as f:
-            readme_content = f.read()
-            self.assertIn(config.name, readme_content)
-            self.assertIn(config.description, readme_content)
-            self.assertIn("rust", readme_content.lower())
-    
-    def test_rust_project_with_subprocess_error(self):
-        """Test Rust project generation when subprocess fails."""
-        with patch('subprocess.run') as mock_run:
-            # Configure the mock to raise a CalledProcessError
-            error = subprocess.CalledProcessError(1, 'cargo init')
-            error.stderr = b"Command failed: cargo init"
-            mock_run.side_effect = error
-            
-            config = ProjectConfig(
-                name="test-rust-error",
-                description="A test Rust project that will fail",
-                project_type=ProjectType.RUST,
-                path=self.test_dir
-            )
-            
-            result = self.generator.generate_project(config)
-            
-            # Check if the generation failed
-            self.assertFalse(result.success)
-            self.assertIn("Failed to initialize Rust project", result.message)
-    
-    def test_common_project_generation(self):
-        """Test common project generation."""
-        config = ProjectConfig(
-            name="test-common",
-            description="A test common project",
-            project_type=ProjectType.COMMON,
-            path=self.test_dir
-        )
-        
-        result = self.generator.generate_project(config)
-        
-        # Check if the generation was successful
-        self.assertTrue(result.success)
-        
-        # Check if essential directories were created
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "src")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "docs")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "examples")))
-        
-        # Check if README.md was created
-        readme_path = os.path.join(self.test_dir, "README.md")
-        self.assertTrue(os.path.exists(readme_path))
-        
-        # Verify README content
-        with open(readme_path, 'r') as f:
-            readme_content = f.read()
-            self.assertIn(config.name, readme_content)
-            self.assertIn(config.description, readme_content)
-            self.assertIn("common", readme_content.lower())
-    
-    def test_project_with_invalid_path(self):
-        """Test project generation with an invalid path."""
-        # Create a path that should not be writable
-        invalid_path = "/nonexistent/directory"  # This assumes the test is not running as root
-        
-        config = ProjectConfig(
-            name="invalid-path-project",
-            description="A project with an invalid path",
-            project_type=ProjectType.PYTHON,
-            path=invalid_path
-        )
-        
-        # Patch os.makedirs to simulate failure
-        with patch('os.makedirs') as mock_makedirs:
-            mock_makedirs.side_effect = PermissionError("Permission denied")
-            
-            result = self.generator.generate_project(config)
-            
-            # Check if the generation failed
-            self.assertFalse(result.success)
-            self.assertTrue("Permission denied" in result.message or "Failed to create project" in result.message)
-    
-    def test_project_with_special_characters(self):
-        """Test project generation with special characters in name/description."""
-        config = ProjectConfig(
-            name="special-chars-!@#",  # This should be normalized in a robust implementation
-            description="Project with special chars: !@#$%^&*()",
-            project_type=ProjectType.PYTHON,
-            path=self.test_dir
-        )
-        
-        result = self.generator.generate_project(config)
-        
-        # Check if the generation was successful (this tests how well the generator handles unusual inputs)
-        self.assertTrue(result.success)
-        
-        # Basic structure tests
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "README.md")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "requirements.txt")))
-
-
-if __name__ == "__main__":
-    unittest.main() 
+import pytest
+
+from project_generator.models import ProjectConfig, ProjectType
+from project_generator.generator import CARGO_TIMEOUT
+from project_generator.tests.helpers import entries, tree
+
+
+# The generated Python project is only read by these tests, so it is
+# generated once per module
+_PYTHON_NAME = "test-project"
+_PYTHON_DESCRIPTION = "A test Python project"
+
+
+@pytest.fixture(scope="module")
+def generated_python_project(tmp_path_factory, generator):
+    """Generate the shared Python project and return its path."""
+    path = tmp_path_factory.mktemp("py")
+    result = generator.generate_project(ProjectConfig(
+        name=_PYTHON_NAME,
+        description=_PYTHON_DESCRIPTION,
+        project_type=ProjectType.PYTHON,
+        path=path
+    ))
+    assert result.success, result.message
+    return path
+
+
+@pytest.fixture(scope="module")
+def python_tree(generated_python_project):
+    """Relative paths of everything in the shared Python project."""
+    return tree(generated_python_project)
+
+
+@pytest.fixture(scope="module")
+def python_dry_run(generator):
+    """Render the shared Python project in memory and return its files."""
+    result = generator.generate_project(ProjectConfig(
+        name=_PYTHON_NAME,
+        description=_PYTHON_DESCRIPTION,
+        project_type=ProjectType.PYTHON,
+        path="/nonexistent/dry-run",
+        dry_run=True
+    ))
+    assert result.success, result.message
+    return result.files
+
+
+# Everything the Python generator is expected to create
+_PYTHON_EXPECTED = {
+    "README.md",
+    "requirements.txt",
+    "setup.py",
+    "src",
+    f"src/{_PYTHON_NAME}",
+    f"src/{_PYTHON_NAME}/__init__.py",
+    f"src/{_PYTHON_NAME}/__version__.py",
+    "src/tests",
+    "src/tests/__init__.py",
+    f"src/tests/test_{_PYTHON_NAME}.py",
+}
+
+
+@pytest.mark.parametrize("rel", sorted(_PYTHON_EXPECTED))
+def test_python_project_layout(python_tree, rel):
+    """Test that each expected file and directory was created."""
+    assert rel in python_tree
+
+
+# Per file: substrings to find as-is, then substrings to find case-insensitively
+@pytest.mark.parametrize("rel, needles, lower_needles", [
+    ("setup.py", (f'name="{_PYTHON_NAME}"', 'version="0.1.0"'), ()),
+    ("README.md", (_PYTHON_NAME, _PYTHON_DESCRIPTION), ("python",)),
+    (f"src/tests/test_{_PYTHON_NAME}.py", (
+        "import unittest",
+        f"from {_PYTHON_NAME} import __version__",
+        f"class Test{_PYTHON_NAME.capitalize()}",
+    ), ()),
+], ids=["setup.py", "README.md", "test-module"])
+def test_python_project_file_contents(python_dry_run, rel, needles, lower_needles):
+    """Test the contents of each generated file."""
+    content = python_dry_run[rel].decode()
+    for needle in needles:
+        assert needle in content
+    for needle in lower_needles:
+        assert needle in content.lower()
+
+
+@pytest.mark.parametrize("project_type", [ProjectType.PYTHON, ProjectType.COMMON])
+def test_dry_run_matches_disk(project_type, tmp_path, generator):
+    """Test that a dry run renders exactly the files and directories a real run creates."""
+    config = ProjectConfig(
+        name=_PYTHON_NAME,
+        description=_PYTHON_DESCRIPTION,
+        project_type=project_type,
+        path=tmp_path
+    )
+    assert generator.generate_project(config).success
+    dry_files = generator.generate_project(config.model_copy(update={"dry_run": True})).files
+
+    # Directories are keyed with a trailing "/" and have no content
+    on_disk = {rel + "/" if (tmp_path / rel).is_dir() else rel for rel in tree(tmp_path)}
+    assert set(dry_files) == on_disk
+    for rel in on_disk:
+        expected = b"" if rel.endswith("/") else (tmp_path / rel).read_bytes()
+        assert dry_files[rel] == expected
+
+
+def test_dry_run_writes_nothing(tmp_path, generator, mock_subprocess_run):
+    """Test that a dry run creates no files and never runs cargo."""
+    target = tmp_path / "dry"
+    result = generator.generate_project(ProjectConfig(
+        name="dry-rust",
+        description="A Rust project rendered in memory",
+        project_type=ProjectType.RUST,
+        use_cargo=True,
+        path=target,
+        dry_run=True
+    ))
+
+    assert result.success
+    assert {"Cargo.toml", "src/", "src/main.rs", ".gitignore", "README.md"} == set(result.files)
+    assert not target.exists()
+    mock_subprocess_run.assert_not_called()
+
+
+def test_python_project_namespace_packages(tmp_path, generator):
+    """Test Python project generation without __init__.py files."""
+    config = ProjectConfig(
+        name="namespace-project",
+        description="A namespace package project",
+        project_type=ProjectType.PYTHON,
+        path=tmp_path,
+        legacy_packages=False
+    )
+
+    result = generator.generate_project(config)
+    assert result.success
+
+    # Package directories and modules exist, but no __init__.py files
+    generated = tree(tmp_path)
+    assert {"src/namespace-project/__version__.py", "src/tests/test_namespace-project.py"} <= generated
+    assert {"src/namespace-project/__init__.py", "src/tests/__init__.py"}.isdisjoint(generated)
+
+    # setup.py must discover namespace packages
+    setup_content = (tmp_path / "setup.py").read_text(encoding="utf-8")
+    assert 'packages=find_namespace_packages(where="src")' in setup_content
+
+
+def test_python_project_with_additional_details(tmp_path, generator):
+    """Test Python project generation with additional details."""
+    config = ProjectConfig(
+        name="advanced-project",
+        description="An advanced Python project with custom details",
+        project_type=ProjectType.PYTHON,
+        path=tmp_path,
+        additional_details={
+            "dependencies": ["requests", "pydantic", "click"]
+        }
+    )
+
+    result = generator.generate_project(config)
+
+    # Check if the generation was successful
+    assert result.success
+
+    # Additional verification should go here if the generator uses additional_details
+    # This is a placeholder as we may enhance the generator to use additional_details in the future
+
+
+@pytest.fixture(scope="module")
+def rust_project(tmp_path_factory, generator):
+    """Generate a cargo-initialized Rust project with cargo mocked out.
+
+    Returns the config, the mocked subprocess.run and the README text, read once.
+    """
+    config = ProjectConfig(
+        name="test-rust",
+        description="A test Rust project",
+        project_type=ProjectType.RUST,
+        use_cargo=True,
+        path=tmp_path_factory.mktemp("rust")
+    )
+    # Mock the subprocess.run call to avoid actual cargo command execution
+    with patch('subprocess.run', autospec=True, return_value=MagicMock(returncode=0)) as mock_run:
+        result = generator.generate_project(config)
+    assert result.success, result.message
+    return {
+        "config": config,
+        "run": mock_run,
+        "readme": (config.path / "README.md").read_text(encoding="utf-8"),
+    }
+
+
+def test_rust_project_runs_cargo_init(rust_project):
+    """Test that cargo init is called with the project name in the project directory."""
+    config = rust_project["config"]
+    rust_project["run"].assert_called_once_with(
+        ["cargo", "init", "--name", config.name],
+        cwd=config.path,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        timeout=CARGO_TIMEOUT
+    )
+
+
+def test_rust_project_readme(rust_project):
+    """Test the Rust project's README content."""
+    config = rust_project["config"]
+    readme = rust_project["readme"]
+    assert config.name in readme
+    assert config.description in readme
+    assert "rust" in readme.lower()
+
+
+def test_rust_project_inline_generation(mock_subprocess_run, tmp_path, generator):
+    """Test Rust project generation from built-in templates without cargo."""
+    config = ProjectConfig(
+        name="inline-rust",
+        description="A Rust project generated without cargo",
+        project_type=ProjectType.RUST,
+        path=tmp_path
+    )
+
+    result = generator.generate_project(config)
+
+    assert result.success
+    mock_subprocess_run.assert_not_called()
+
+    # Check the files cargo init would have created
+    cargo_toml = (tmp_path / "Cargo.toml").read_text(encoding="utf-8")
+    assert 'name = "inline-rust"' in cargo_toml
+    assert 'edition = "2021"' in cargo_toml
+    assert {"src/main.rs", ".gitignore", "README.md"} <= tree(tmp_path)
+
+
+@pytest.mark.parametrize("name", [
+    'quote"name', "a b", "project/with:reserved*chars?", "1st", "",
+    # Reserved by Rust or cargo
+    "test", "fn", "self", "deps", "build", "examples", "incremental",
+    # Accepted by cargo, but the generator only allows ASCII names
+    "caf\u00e9",
+])
+def test_rust_inline_rejects_invalid_package_name(name, tmp_path, generator):
+    """Test that invalid package names fail instead of writing a Cargo.toml cargo refuses."""
+    config = ProjectConfig(
+        name=name,
+        description="A Rust project with an invalid package name",
+        project_type=ProjectType.RUST,
+        path=tmp_path
+    )
+
+    result = generator.generate_project(config)
+
+    assert not result.success
+    assert "Invalid Rust package name" in result.message
+    assert "Cargo.toml" not in entries(tmp_path)
+
+
+def test_rust_project_with_subprocess_error(mock_subprocess_run, tmp_path, generator):
+    """Test Rust project generation when subprocess fails."""
+    # Configure the mock to raise a CalledProcessError (without captured stderr)
+    mock_subprocess_run.side_effect = subprocess.CalledProcessError(1, 'cargo init')
+
+    config = ProjectConfig(
+        name="test-rust-error",
+        description="A test Rust project that will fail",
+        project_type=ProjectType.RUST,
+        use_cargo=True,
+        path=tmp_path
+    )
+
+    result = generator.generate_project(config)
+
+    # Check if the generation failed
+    assert not result.success
+    assert "Failed to initialize Rust project: cargo exited with status 1" in result.message
+
+
+def test_rust_project_with_cargo_timeout(mock_subprocess_run, tmp_path, generator):
+    """Test Rust project generation when cargo hangs past the timeout."""
+    mock_subprocess_run.side_effect = subprocess.TimeoutExpired('cargo init', 60)
+
+    config = ProjectConfig(
+        name="test-rust-timeout",
+        description="A test Rust project whose cargo call hangs",
+        project_type=ProjectType.RUST,
+        use_cargo=True,
+        path=tmp_path
+    )
+
+    result = generator.generate_project(config)
+
+    assert not result.success
+    assert "timed out" in result.message
+
+
+@pytest.fixture(scope="module")
+def common_project(tmp_path_factory, generator):
+    """Generate a common project; returns its config and README text."""
+    config = ProjectConfig(
+        name="test-common",
+        description="A test common project",
+        project_type=ProjectType.COMMON,
+        path=tmp_path_factory.mktemp("common")
+    )
+    result = generator.generate_project(config)
+    assert result.success, result.message
+    return {"config": config, "readme": (config.path / "README.md").read_text(encoding="utf-8")}
+
+
+def test_common_project_directories(common_project):
+    """Test that the common project's directories were created."""
+    assert {"src", "docs", "examples"} <= entries(common_project["config"].path)
+
+
+def test_common_project_readme(common_project):
+    """Test the common project's README content."""
+    config = common_project["config"]
+    readme = common_project["readme"]
+    assert config.name in readme
+    assert config.description in readme
+    assert "common" in readme.lower()
+
+
+def test_project_with_invalid_path(generator):
+    """Test project generation with an invalid path."""
+    # Create a path that should not be writable
+    invalid_path = "/nonexistent/directory"  # This assumes the test is not running as root
+
+    config = ProjectConfig(
+        name="invalid-path-project",
+        description="A project with an invalid path",
+        project_type=ProjectType.PYTHON,
+        path=invalid_path
+    )
+
+    # Make this generator's directory creation fail; os.makedirs itself
+    # stays untouched for everything else in the process
+    with patch.object(generator, '_ensure_dir') as mock_ensure_dir:
+        mock_ensure_dir.side_effect = PermissionError("Permission denied")
+
+        result = generator.generate_project(config)
+
+        # Check if the generation failed
+        assert not result.success
+        assert "Permission denied" in result.message or "Failed to create project" in result.message
+
+
+def test_project_with_special_characters(tmp_path, generator):
+    """Test project generation with special characters in name/description."""
+    config = ProjectConfig(
+        name="special-chars-!@#",  # This should be normalized in a robust implementation
+        description="Project with special chars: !@#$%^&*()",
+        project_type=ProjectType.PYTHON,
+        path=tmp_path
+    )
+
+    result = generator.generate_project(config)
+
+    # Check if the generation was successful (this tests how well the generator handles unusual inputs)
+    assert result.success
+
+    # Basic structure tests
+    assert {"README.md", "requirements.txt"} <= entries(tmp_path)